@@ -1,20 +1,30 @@
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from src.modules.v1.file_controller.router import router as file_router
 from src.modules.v1.github_oauth.router import github_oauth_router  
 from starlette.middleware.sessions import SessionMiddleware
 from src.config import config
-from src.lib.oauth import oauth
+from src.lib.oauth import github_api, oauth
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Close pooled GitHub API connections
+    await github_api.aclose()
+
+
 app = FastAPI(
     title="Quantum Doc API",
     description="Backend API for Quantum Doc application with GitHub OAuth",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 
@@ -86,7 +96,7 @@ async def debug_session(request: Request):
     return {
         "session_id": id(request.session),
         "session_data": dict(request.session),
-        "oauth_state": request.session.get("oauth_state"),
+        "oauth_state_keys": [k for k in request.session if k.startswith("_state_")],
         "user": request.session.get("user"),
         "cookies": dict(request.cookies),
         "headers": dict(request.headers)
@@ -1,3 +1,13 @@
+import httpx
 from authlib.integrations.starlette_client import OAuth
 
 oauth = OAuth()
+
+# Shared client for GitHub REST calls. Authlib opens a new client per request,
+# so API calls go through this one to reuse pooled HTTP/2 connections.
+github_api = httpx.AsyncClient(
+    base_url="https://api.github.com/",
+    http2=True,
+    timeout=5.0,
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+)
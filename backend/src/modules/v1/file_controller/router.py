@@ -1,15 +1,22 @@
 from pathlib import Path
+from functools import lru_cache
+import asyncio
+import os
+import stat
 import subprocess
 from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
 from fnmatch import fnmatch
 from constants import USERNAME, REPO_SLUG
 from src.modules.v1.file_controller.controller import (
-    _commit_and_push_changes,
+    _read_file_bytes,
+    commit_and_push_changes,
+    repo_lock,
+    write_repo_file,
 )
 from src.modules.v1.file_controller.model import (
     DirectoryResponse,
     FileContentResponse,
-    FileItem,
     SaveFileResponse,
     SaveFileRequest,
     CreateFileResponse,
@@ -58,18 +65,7 @@ async def list_directory(
             raise HTTPException(status_code=400, detail="Path is not a directory")
 
         # Read .levelerignore file if it exists
-        ignore_patterns = []
-        levelerignore_path = repo_path / ".levelerignore"
-        if levelerignore_path.exists() and levelerignore_path.is_file():
-            try:
-                ignore_patterns = [
-                    line.strip()
-                    for line in levelerignore_path.read_text().splitlines()
-                    if line.strip() and not line.strip().startswith("#")
-                ]
-            except Exception:
-                # If we can't read the ignore file, continue without it
-                pass
+        ignore_patterns = _load_ignore_patterns(repo_path)
 
         # Parse filter string into list of patterns
         filter_patterns = []
@@ -80,10 +76,22 @@ async def list_directory(
             ]
         # If filter is empty, show all files
 
+        # Resolve the directory's relative path once and prefix entry names,
+        # instead of calling Path.relative_to for every entry
+        relative_dir = str(target_path.relative_to(repo_path))
+        prefix = "" if relative_dir == "." else relative_dir + "/"
+
+        with os.scandir(target_path) as it:
+            entries = list(it)
+
         items = []
-        for item in target_path.iterdir():
+        for item in entries:
+            # DirEntry caches the file type from readdir; query it once per entry
+            is_dir = item.is_dir()
+            is_file = item.is_file()
+
             # Check if item should be ignored
-            item_relative_path = str(item.relative_to(repo_path))
+            item_relative_path = prefix + item.name
             should_ignore = False
 
             for pattern in ignore_patterns:
@@ -96,7 +104,7 @@ async def list_directory(
                         break
                 elif pattern.endswith("/"):
                     # Directory pattern
-                    if item.is_dir() and (
+                    if is_dir and (
                         item.name == pattern[:-1]
                         or item_relative_path.startswith(pattern[:-1] + "/")
                     ):
@@ -112,7 +120,7 @@ async def list_directory(
                 continue
 
             # Filtering logic: always include directories, filter files if filter_patterns is set
-            if item.is_file() and filter_patterns:
+            if is_file and filter_patterns:
                 # Match against name and/or extension
                 matched = False
                 for pat in filter_patterns:
@@ -128,21 +136,23 @@ async def list_directory(
                 if not matched:
                     continue  # Skip this file
 
-            file_info = {
-                "name": item.name,
-                "path": item_relative_path,
-                "type": "directory" if item.is_dir() else "file",
-                "size": item.stat().st_size if item.is_file() else None,
-                "extension": item.suffix if item.is_file() else None,
-            }
-            items.append(FileItem(**file_info))
+            # Plain dicts shaped like FileItem; no per-entry model instances
+            items.append(
+                {
+                    "name": item.name,
+                    "path": item_relative_path,
+                    "type": "directory" if is_dir else "file",
+                    "size": item.stat().st_size if is_file else None,
+                    "extension": _suffix(item.name) if is_file else None,
+                }
+            )
 
         # Sort: directories first, then files, both alphabetically
-        items.sort(key=lambda x: (x.type == "file", x.name.lower()))
+        items.sort(key=lambda x: (x["type"] == "file", x["name"].lower()))
 
-        return DirectoryResponse(
-            path=str(target_path.relative_to(repo_path)), items=items
-        )
+        # Returning a Response skips FastAPI's validation and serialization;
+        # response_model is kept for the OpenAPI schema.
+        return ORJSONResponse({"path": relative_dir, "items": items})
 
     except Exception as e:
         raise HTTPException(
@@ -172,15 +182,9 @@ async def get_file_content(
             raise HTTPException(status_code=400, detail="Path is not a file")
 
         # Check if file should be ignored
-        levelerignore_path = repo_path / ".levelerignore"
-        if levelerignore_path.exists() and levelerignore_path.is_file():
+        ignore_patterns = _load_ignore_patterns(repo_path)
+        if ignore_patterns:
             try:
-                ignore_patterns = [
-                    line.strip()
-                    for line in levelerignore_path.read_text().splitlines()
-                    if line.strip() and not line.strip().startswith("#")
-                ]
-
                 for pattern in ignore_patterns:
                     if pattern.startswith("/"):
                         # Absolute pattern from repo root
@@ -209,17 +213,22 @@ async def get_file_content(
         # Allow all file types
         # No file type restriction
 
-        # Read file content
+        # Read file content off the event loop so large files don't stall other requests
+        data = await asyncio.to_thread(_read_file_bytes, file_path)
         try:
-            content = file_path.read_text(encoding="utf-8")
+            content = data.decode("utf-8")
         except UnicodeDecodeError:
-            # Try with different encoding if UTF-8 fails
-            content = file_path.read_text(encoding="latin-1")
+            # Try with different encoding if UTF-8 fails, without re-reading the file
+            content = data.decode("latin-1")
             encoding = "latin-1"
         else:
             encoding = "utf-8"
+        # Match read_text()'s universal-newline translation
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
 
-        return FileContentResponse(path=path, content=content, encoding=encoding)
+        # Plain dict shaped like FileContentResponse, as in list_directory
+        return ORJSONResponse({"path": path, "content": content, "encoding": encoding})
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading file: {str(e)}")
@@ -252,15 +261,9 @@ async def save_file_content(
             raise HTTPException(status_code=404, detail="Repository not found")
 
         # Check if file should be ignored
-        levelerignore_path = repo_path / ".levelerignore"
-        if levelerignore_path.exists() and levelerignore_path.is_file():
+        ignore_patterns = _load_ignore_patterns(repo_path)
+        if ignore_patterns:
             try:
-                ignore_patterns = [
-                    line.strip()
-                    for line in levelerignore_path.read_text().splitlines()
-                    if line.strip() and not line.strip().startswith("#")
-                ]
-
                 for pattern in ignore_patterns:
                     if pattern.startswith("/"):
                         # Absolute pattern from repo root
@@ -286,24 +289,29 @@ async def save_file_content(
                 # If we can't read the ignore file, continue without it
                 pass
 
-        # Ensure the parent directory exists
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        # Mutate the tree and commit under one repo lock, so a concurrent
+        # request's git add/commit never picks up a half-done change
+        async with repo_lock(repo_path):
+            # Ensure the parent directory exists
+            file_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Write file content
-        try:
-            file_path.write_text(file_data.content, encoding=file_data.encoding)
-        except Exception as write_error:
-            raise HTTPException(
-                status_code=500, detail=f"Error writing file: {str(write_error)}"
-            )
+            # Write file content
+            try:
+                await write_repo_file(
+                    repo_path, file_path, file_data.content, encoding=file_data.encoding
+                )
+            except Exception as write_error:
+                raise HTTPException(
+                    status_code=500, detail=f"Error writing file: {str(write_error)}"
+                )
 
-        _commit_and_push_changes(
-            repo_path=repo_path,
-            commit_message=f"Updated by {by}",
-            access_token=access_token,
-            user_email=user_email,
-            user_name=by,
-        )
+            await commit_and_push_changes(
+                repo_path=repo_path,
+                commit_message=f"Updated by {by}",
+                access_token=access_token,
+                user_email=user_email,
+                user_name=by,
+            )
 
         return SaveFileResponse(
             path=path,
@@ -340,29 +348,39 @@ async def create_file(
         if not repo_path.exists():
             raise HTTPException(status_code=404, detail="Repository not found")
 
-        # Check if file already exists
-        if file_path.exists():
-            raise HTTPException(status_code=409, detail="File already exists")
+        # Mutate the tree and commit under one repo lock, so a concurrent
+        # request's git add/commit never picks up a half-done change
+        async with repo_lock(repo_path):
+            # Ensure the parent directory exists
+            file_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Ensure the parent directory exists
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+            # Create and write the new file; O_EXCL does the "already exists"
+            # check atomically and the mode is set at creation time
+            try:
+                payload = file_data.content.encode(file_data.encoding)
+                fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            except FileExistsError:
+                raise HTTPException(status_code=409, detail="File already exists")
+            except Exception as write_error:
+                raise HTTPException(
+                    status_code=500, detail=f"Error creating file: {str(write_error)}"
+                )
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+            except Exception as write_error:
+                raise HTTPException(
+                    status_code=500, detail=f"Error creating file: {str(write_error)}"
+                )
 
-        # Write empty content to the new file
-        try:
-            file_path.write_text(file_data.content, encoding=file_data.encoding)
-        except Exception as write_error:
-            raise HTTPException(
-                status_code=500, detail=f"Error creating file: {str(write_error)}"
+            await commit_and_push_changes(
+                repo_path=repo_path,
+                commit_message=f"Created by {by}",
+                access_token=access_token,
+                user_email=user_email,
+                user_name=by,
             )
 
-        _commit_and_push_changes(
-            repo_path=repo_path,
-            commit_message=f"Created by {by}",
-            access_token=access_token,
-            user_email=user_email,
-            user_name=by,
-        )
-
         return CreateFileResponse(
             path=str(file_path.relative_to(repo_path)),
             message="File created successfully",
@@ -398,31 +416,34 @@ async def create_directory(
         if not repo_path.exists():
             raise HTTPException(status_code=404, detail="Repository not found")
 
-        # Check if directory already exists
-        if dir_path.exists():
-            raise HTTPException(status_code=409, detail="Directory already exists")
+        # Mutate the tree and commit under one repo lock, so a concurrent
+        # request's git add/commit never picks up a half-done change
+        async with repo_lock(repo_path):
+            # Check if directory already exists
+            if dir_path.exists():
+                raise HTTPException(status_code=409, detail="Directory already exists")
 
-        # Ensure the parent directory exists
-        dir_path.parent.mkdir(parents=True, exist_ok=True)
+            # Ensure the parent directory exists
+            dir_path.parent.mkdir(parents=True, exist_ok=True)
 
-        # Create the new directory
-        try:
-            dir_path.mkdir(parents=True, exist_ok=False)
-            # Create a .gitkeep file inside the new directory
-            gitkeep_path = dir_path / ".gitkeep"
-            gitkeep_path.touch(exist_ok=True)
-        except Exception as create_error:
-            raise HTTPException(
-                status_code=500, detail=f"Error creating directory: {str(create_error)}"
-            )
+            # Create the new directory
+            try:
+                dir_path.mkdir(parents=True, exist_ok=False)
+                # Create a .gitkeep file inside the new directory
+                gitkeep_path = dir_path / ".gitkeep"
+                gitkeep_path.touch(exist_ok=True)
+            except Exception as create_error:
+                raise HTTPException(
+                    status_code=500, detail=f"Error creating directory: {str(create_error)}"
+                )
 
-        _commit_and_push_changes(
-            repo_path=repo_path,
-            commit_message=f"Created by {by}",
-            access_token=access_token,
-            user_email=user_email,
-            user_name=by,
-        )
+            await commit_and_push_changes(
+                repo_path=repo_path,
+                commit_message=f"Created by {by}",
+                access_token=access_token,
+                user_email=user_email,
+                user_name=by,
+            )
 
         return CreateDirectoryResponse(
             path=str(dir_path.relative_to(repo_path)),
@@ -465,15 +486,9 @@ async def delete_file(
             raise HTTPException(status_code=404, detail="File or directory not found")
 
         # Check if file should be ignored
-        levelerignore_path = repo_path / ".levelerignore"
-        if levelerignore_path.exists() and levelerignore_path.is_file():
+        ignore_patterns = _load_ignore_patterns(repo_path)
+        if ignore_patterns:
             try:
-                ignore_patterns = [
-                    line.strip()
-                    for line in levelerignore_path.read_text().splitlines()
-                    if line.strip() and not line.strip().startswith("#")
-                ]
-
                 for pattern in ignore_patterns:
                     if pattern.startswith("/"):
                         # Absolute pattern from repo root
@@ -501,31 +516,34 @@ async def delete_file(
                 # If we can't read the ignore file, continue without it
                 pass
 
-        # Delete the file or directory
-        try:
-            if target_path.is_file():
-                target_path.unlink()
-            elif target_path.is_dir():
-                import shutil
+        # Mutate the tree and commit under one repo lock, so a concurrent
+        # request's git add/commit never picks up a half-done change
+        async with repo_lock(repo_path):
+            # Delete the file or directory
+            try:
+                if target_path.is_file():
+                    target_path.unlink()
+                elif target_path.is_dir():
+                    import shutil
 
-                shutil.rmtree(target_path)
-            else:
+                    shutil.rmtree(target_path)
+                else:
+                    raise HTTPException(
+                        status_code=400, detail="Path is neither a file nor directory"
+                    )
+            except Exception as delete_error:
                 raise HTTPException(
-                    status_code=400, detail="Path is neither a file nor directory"
+                    status_code=500,
+                    detail=f"Error deleting file/directory: {str(delete_error)}",
                 )
-        except Exception as delete_error:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error deleting file/directory: {str(delete_error)}",
-            )
 
-        _commit_and_push_changes(
-            repo_path=repo_path,
-            commit_message=f"Deleted by {by}",
-            access_token=access_token,
-            user_email=user_email,
-            user_name=by,
-        )
+            await commit_and_push_changes(
+                repo_path=repo_path,
+                commit_message=f"Deleted by {by}",
+                access_token=access_token,
+                user_email=user_email,
+                user_name=by,
+            )
 
         return DeleteFileResponse(
             path=file_data.path,
@@ -588,15 +606,9 @@ async def rename_file(
             )
 
         # Check if old file should be ignored
-        levelerignore_path = repo_path / ".levelerignore"
-        if levelerignore_path.exists() and levelerignore_path.is_file():
+        ignore_patterns = _load_ignore_patterns(repo_path)
+        if ignore_patterns:
             try:
-                ignore_patterns = [
-                    line.strip()
-                    for line in levelerignore_path.read_text().splitlines()
-                    if line.strip() and not line.strip().startswith("#")
-                ]
-
                 for pattern in ignore_patterns:
                     if pattern.startswith("/"):
                         # Absolute pattern from repo root
@@ -624,22 +636,25 @@ async def rename_file(
                 # If we can't read the ignore file, continue without it
                 pass
 
-        # Rename the file or directory
-        try:
-            old_path.rename(new_path)
-        except Exception as rename_error:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Error renaming file/directory: {str(rename_error)}",
-            )
+        # Mutate the tree and commit under one repo lock, so a concurrent
+        # request's git add/commit never picks up a half-done change
+        async with repo_lock(repo_path):
+            # Rename the file or directory
+            try:
+                old_path.rename(new_path)
+            except Exception as rename_error:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Error renaming file/directory: {str(rename_error)}",
+                )
 
-        _commit_and_push_changes(
-            repo_path=repo_path,
-            commit_message=f"Renamed by {by} from {file_data.old_path} to {file_data.new_name}",
-            access_token=access_token,
-            user_email=user_email,
-            user_name=by,
-        )
+            await commit_and_push_changes(
+                repo_path=repo_path,
+                commit_message=f"Renamed by {by} from {file_data.old_path} to {file_data.new_name}",
+                access_token=access_token,
+                user_email=user_email,
+                user_name=by,
+            )
 
         return RenameFileResponse(
             old_path=file_data.old_path,
@@ -680,8 +695,9 @@ async def get_changed_files(request: Request):
         current_time = time.time()
 
         try:
-            # Run git status to get changed files
-            result = subprocess.run(
+            # Run git status to get changed files, off the event loop
+            result = await asyncio.to_thread(
+                subprocess.run,
                 ["git", "status", "--porcelain"],
                 cwd=repo_path,
                 capture_output=True,
@@ -752,14 +768,17 @@ async def push_changes(request: Request, push_data: PushRequest):
         if not repo_path.exists():
             raise HTTPException(status_code=404, detail="Repository not found")
     
-        # Commit and push changes
-        result = _commit_and_push_changes(
-            repo_path=repo_path,
-            commit_message=f"{push_data.commit_message} by {by}",
-            access_token=access_token,
-            user_email=user_email,
-            user_name=by,
-        )
+        # Mutate the tree and commit under one repo lock, so a concurrent
+        # request's git add/commit never picks up a half-done change
+        async with repo_lock(repo_path):
+            # Commit and push changes
+            result = await commit_and_push_changes(
+                repo_path=repo_path,
+                commit_message=f"{push_data.commit_message} by {by}",
+                access_token=access_token,
+                user_email=user_email,
+                user_name=by,
+            )
 
         return PushResponse(
             message=result.get("message", "Changes pushed successfully"),
@@ -776,20 +795,42 @@ async def push_changes(request: Request, push_data: PushRequest):
         )
 
 
-def _should_ignore_file(repo_path: Path, file_path: str) -> bool:
-    """Check if a file should be ignored based on .levelerignore patterns."""
-    levelerignore_path = repo_path / ".levelerignore"
-    if not levelerignore_path.exists() or not levelerignore_path.is_file():
-        return False
+def _suffix(name: str) -> str:
+    """Same result as Path(name).suffix without building a Path."""
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return name[i:]
+    return ""
 
+
+@lru_cache(maxsize=64)
+def _compiled_ignore(repo_path_str: str, mtime_ns: int) -> tuple[str, ...]:
+    """Parse .levelerignore patterns; cached until the file's mtime changes."""
+    text = Path(repo_path_str, ".levelerignore").read_text()
+    return tuple(
+        line.strip()
+        for line in text.splitlines()
+        if line.strip() and not line.strip().startswith("#")
+    )
+
+
+def _load_ignore_patterns(repo_path: Path) -> tuple[str, ...]:
+    """Return the .levelerignore patterns for a repository (empty if none)."""
+    repo_path_str = os.path.abspath(repo_path)
     try:
-        ignore_patterns = [
-            line.strip()
-            for line in levelerignore_path.read_text().splitlines()
-            if line.strip() and not line.strip().startswith("#")
-        ]
+        st = os.stat(os.path.join(repo_path_str, ".levelerignore"))
+        if not stat.S_ISREG(st.st_mode):
+            return ()
+        return _compiled_ignore(repo_path_str, st.st_mtime_ns)
+    except Exception:
+        # If we can't read the ignore file, continue without it
+        return ()
 
-        for pattern in ignore_patterns:
+
+def _should_ignore_file(repo_path: Path, file_path: str) -> bool:
+    """Check if a file should be ignored based on .levelerignore patterns."""
+    try:
+        for pattern in _load_ignore_patterns(repo_path):
             if pattern.startswith("/"):
                 # Absolute pattern from repo root
                 if file_path == pattern[1:] or file_path.startswith(pattern[1:] + "/"):
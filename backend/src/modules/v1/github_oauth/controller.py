@@ -1,69 +1,52 @@
+import asyncio
 from fastapi import Request, HTTPException
-from src.lib.oauth import oauth
+from src.lib.oauth import github_api, oauth
 import logging
 from authlib.integrations.starlette_client import OAuthError
 from starlette.responses import RedirectResponse
 from src.config import config
-import secrets
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+
+@lru_cache(maxsize=16)
+def _github_callback_url(router, base_url: str) -> str:
+    """Resolve the OAuth callback URL once per app/host instead of per login"""
+    return str(router.url_path_for("auth_github_callback").make_absolute_url(base_url))
+
+
 async def initiate_github_oauth_login(request: Request):
     """Initiate GitHub OAuth login flow"""
     try:
-        # Generate a secure state parameter and store it in session
-        state = secrets.token_urlsafe(32)
-        request.session["oauth_state"] = state
-        
         # Use the correct route name that matches the callback route
-        redirect_uri = request.url_for("auth_github_callback")
-        logger.info(f"Redirect URI: {redirect_uri}")
-        logger.info(f"Generated state: {state}")
-        logger.info(f"Session ID: {id(request.session)}")
-        logger.info(f"Session data before redirect: {dict(request.session)}")
+        redirect_uri = _github_callback_url(request.app.router, str(request.base_url))
+        logger.info("Redirect URI: %s", redirect_uri)
+        logger.info("Session ID: %s", id(request.session))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Session data before redirect: %s", dict(request.session))
         
-        return await oauth.github.authorize_redirect(
-            request, 
-            redirect_uri,
-            state=state
-        )
+        # Authlib generates the state and stores it in the session itself
+        return await oauth.github.authorize_redirect(request, redirect_uri)
     except Exception as e:
-        logger.error(f"Error in GitHub OAuth login: {e}")
+        logger.error("Error in GitHub OAuth login: %s", e)
         raise HTTPException(status_code=500, detail="Failed to initiate OAuth login")
 
 
 async def complete_github_oauth_login(request: Request):
     """Handle GitHub OAuth callback"""
     try:
-        logger.info(f"OAuth callback received with query params: {dict(request.query_params)}")
-        logger.info(f"Session ID in callback: {id(request.session)}")
-        logger.info(f"Session data in callback: {dict(request.session)}")
-        
-        # Verify state parameter
-        expected_state = request.session.get("oauth_state")
-        received_state = request.query_params.get("state")
-        
-        logger.info(f"Expected state: {expected_state}")
-        logger.info(f"Received state: {received_state}")
-        
-        if not expected_state or not received_state or expected_state != received_state:
-            logger.error(f"State mismatch: expected={expected_state}, received={received_state}")
-            # Clear the invalid state
-            request.session.pop("oauth_state", None)
-            raise HTTPException(
-                status_code=400, 
-                detail="Invalid state parameter. Please try logging in again."
-            )
-        
-        # Clear the state after successful verification
-        request.session.pop("oauth_state", None)
+        logger.info("OAuth callback received with query params: %s", request.query_params)
+        logger.info("Session ID in callback: %s", id(request.session))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Session data in callback: %s", dict(request.session))
         
+        # Authlib verifies the state against the one it stored at login and
+        # raises MismatchingStateError (an OAuthError) if it doesn't match
         token = await oauth.github.authorize_access_token(request)
-        logger.info(f"OAuth token received: {token.get('access_token', 'No access token')[:10]}...")
+        logger.info("OAuth token received: %.10s...", token.get("access_token", "No access token"))
     except OAuthError as e:
-        logger.error(f"OAuth error in callback: {e}")
-        # Clear any stored state on error
-        request.session.pop("oauth_state", None)
+        logger.error("OAuth error in callback: %s", e)
         raise HTTPException(
             status_code=400, 
             detail=f"OAuth error: {getattr(e, 'error', str(e))}"
@@ -71,21 +54,24 @@ async def complete_github_oauth_login(request: Request):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Unexpected error in OAuth callback: {e}")
-        # Clear any stored state on error
-        request.session.pop("oauth_state", None)
+        logger.error("Unexpected error in OAuth callback: %s", e)
         raise HTTPException(status_code=500, detail="Authentication failed")
 
     try:
-        # Get user profile
-        user_resp = await oauth.github.get("user", token=token)
+        # Get user profile and emails (requires user:email scope) concurrently
+        headers = {
+            "Authorization": f"Bearer {token['access_token']}",
+            "Accept": "application/vnd.github+json",
+        }
+        user_resp, emails_resp = await asyncio.gather(
+            github_api.get("user", headers=headers),
+            github_api.get("user/emails", headers=headers),
+        )
         if user_resp.status_code != 200:
             raise HTTPException(status_code=500, detail="Failed to fetch user profile")
         
         user_json = user_resp.json()
 
-        # Get user emails (requires user:email scope)
-        emails_resp = await oauth.github.get("user/emails", token=token)
         emails = emails_resp.json() if emails_resp.status_code == 200 else []
         primary_email = next((e["email"] for e in emails if e.get("primary")), None)
 
@@ -100,24 +86,27 @@ async def complete_github_oauth_login(request: Request):
         }
         
         request.session["user"] = user_data
-        logger.info(f"User {user_json['login']} successfully authenticated and stored in session")
-        logger.info(f"Session data: {request.session}")
+        logger.info("User %s successfully authenticated and stored in session", user_json["login"])
+        logger.debug("Session data: %s", request.session)
         
         return RedirectResponse(url=config.frontend_url)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error processing user data: {e}")
+        logger.error("Error processing user data: %s", e)
         raise HTTPException(status_code=500, detail="Failed to process user data")
 
 
 async def get_user_data(request: Request):
-    """Get current user information"""
-    logger.info(f"Session data in /me endpoint: {request.session}")
+    """Get current user information (cached on the request scope)"""
+    if "user_cached" in request.scope:
+        return request.scope["user_cached"]
+    logger.debug("Session data in /me endpoint: %s", request.session)
     user = request.session.get("user")
     if not user:
         logger.warning("No user found in session")
         raise HTTPException(status_code=401, detail="Not authenticated")
-    logger.info(f"User found in session: {user.get('login', 'Unknown')}")
+    logger.info("User found in session: %s", user.get("login", "Unknown"))
+    request.scope["user_cached"] = user
     return user
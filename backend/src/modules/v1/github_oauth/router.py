@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import ORJSONResponse
 from starlette.responses import RedirectResponse
 from src.modules.v1.github_oauth.controller import (
     initiate_github_oauth_login,
@@ -18,9 +19,9 @@ async def auth_github_callback(request: Request):
     return await complete_github_oauth_login(request)
 
 
-@github_oauth_router.get("/me")
-async def me(request: Request):
-    return await get_user_data(request)
+@github_oauth_router.get("/me", response_class=ORJSONResponse)
+async def me(user: dict = Depends(get_user_data)):
+    return user
 
 
 @github_oauth_router.get("/logout")
@@ -29,14 +30,13 @@ async def logout(request: Request):
     return RedirectResponse(url="/")
 
 
-@github_oauth_router.get("/status")
+@github_oauth_router.get("/status", response_class=ORJSONResponse)
 async def auth_status(request: Request):
     user = request.session.get("user")
     return {
         "authenticated": user is not None, 
         "user": user,
         "session_keys": list(request.session.keys()) if request.session else [],
-        "session_data": dict(request.session) if request.session else {},
         "has_token": user.get("token") is not None if user else False,
         "token_keys": list(user.get("token", {}).keys()) if user and user.get("token") else []
     }